@@ -3,16 +3,40 @@
 
 import requests
 import json
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 # Import the API URL and all fallback data from the config file.
 # This keeps configuration separate from the service logic.
 from config import API_URL, FALLBACK_JOB, FALLBACK_RENT_OPTIONS, FALLBACK_LIFE_EVENT, FALLBACK_MONTHLY_CHOICES
+from config import API_URL_TEMPLATE, AI_DEADLINE_SECONDS, AI_REQUEST_TIMEOUT_SECONDS, HEDGE_MIN_SAMPLES
+from model_router import ModelRouter
 
+# Picks the fastest suitable model for each generator, based on how past calls went.
+router = ModelRouter()
 
-def call_gemini(payload):
+# A small pool of background workers for AI calls.
+# Running calls in the background lets the game stop waiting at the deadline
+# while a slow reply keeps going and still fills the cache when it arrives.
+_executor = ThreadPoolExecutor(max_workers=8)
+
+# The most recent reply times (in seconds) for each generator, used to work out its observed p95.
+# They are kept apart because a tiny life event replies much faster than a list of 10 choices.
+_latencies = defaultdict(lambda: deque(maxlen=100))
+
+# The last good reply for each payload, so a late or failed call can still serve real content.
+_cache = {}
+_lock = threading.Lock()
+
+
+def call_gemini(payload, model=None, timeout=AI_REQUEST_TIMEOUT_SECONDS):
     """
     A generic function used to call the Gemini API service.
     It sends a pre-formatted payload and handles the JSON response.
     This function is the central point of communication with the AI.
+    If 'model' is given, the request goes to that model instead of the default one.
+    The request gives up after 'timeout' seconds, so a hung call never ties up a worker for good.
     """
     # Set the header to tell the server we are sending data in JSON format.
     # This is a requirement for the Gemini API.
@@ -20,7 +44,8 @@ def call_gemini(payload):
 
     # Send the request to the API URL using a POST request, which is used for sending data.
     # The payload (a Python dictionary) is converted to a JSON string.
-    response = requests.post(API_URL, headers=headers, data=json.dumps(payload))
+    url = API_URL if model is None else API_URL_TEMPLATE.format(model=model)
+    response = requests.post(url, headers=headers, data=json.dumps(payload), timeout=timeout)
 
     # This is a critical error-checking step. If the server returns an error
     # (like 404 Not Found or 500 Server Error), it will raise an exception.
@@ -35,7 +60,80 @@ def call_gemini(payload):
     return json.loads(result['candidates'][0]['content']['parts'][0]['text'])
 
 
-def generate_random_job(country):
+def observed_p95(generator=None):
+    """Returns the 95th percentile reply time seen so far for 'generator', or None if there are too few samples."""
+    with _lock:
+        samples = sorted(_latencies[generator])
+    if len(samples) < HEDGE_MIN_SAMPLES:
+        return None
+    return samples[int(0.95 * (len(samples) - 1))]
+
+
+def _timed_call(payload, cache_key, generator):
+    """Calls the API in a background worker, recording how long it took and caching the reply."""
+    start = time.monotonic()
+    # The router picks the model, and a hedged duplicate may well go to a different one.
+    result = router.call(generator, payload, call_gemini)
+    with _lock:
+        _latencies[generator].append(time.monotonic() - start)
+        _cache[cache_key] = result
+    return result
+
+
+def call_gemini_with_deadline(payload, deadline=AI_DEADLINE_SECONDS, generator=None):
+    """
+    Calls the Gemini API, but never waits longer than 'deadline' seconds.
+    If no reply has arrived by the observed p95 for this generator, a second (hedged) copy of the request is sent
+    and whichever reply comes back first wins.
+    When the deadline passes, the last cached reply for this payload is returned instead.
+    If there is nothing cached, an exception is raised so the caller can use its fallback.
+    Passing deadline=None waits for the reply however long it takes.
+    'generator' names the calling function so the router can pick the right model for it.
+    """
+    # The payload itself is the cache key, so the same question always maps to the same answer.
+    cache_key = json.dumps(payload, sort_keys=True)
+    start = time.monotonic()
+    pending = {_executor.submit(_timed_call, payload, cache_key, generator)}
+
+    # Only hedge if we have a trustworthy p95 that comes before the deadline.
+    hedge_at = observed_p95(generator)
+    hedged = hedge_at is None or (deadline is not None and hedge_at >= deadline)
+    last_error = None
+
+    while pending:
+        elapsed = time.monotonic() - start
+        if not hedged:
+            timeout = hedge_at - elapsed
+        elif deadline is not None:
+            timeout = deadline - elapsed
+        else:
+            timeout = None
+
+        if timeout is not None and timeout <= 0:
+            if hedged:
+                # The deadline has passed. Stop waiting; late replies will still fill the cache.
+                break
+            # The first request is slower than usual, so fire a duplicate and race them.
+            pending.add(_executor.submit(_timed_call, payload, cache_key, generator))
+            hedged = True
+            continue
+
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            last_error = future.exception()
+
+    # No reply in time (or every request failed), so serve the cached reply if there is one.
+    with _lock:
+        if cache_key in _cache:
+            return _cache[cache_key]
+    if last_error is not None:
+        raise last_error
+    raise TimeoutError(f"no reply within {deadline} seconds")
+
+
+def generate_random_job(country, deadline=AI_DEADLINE_SECONDS):
     """Generates a single random job and income based on the player's country."""
     print(f'Thinking.....\nGenerating career options for {country}.....')
 
@@ -61,7 +159,7 @@ def generate_random_job(country):
 
     try:
         # Attempt to call the API with the constructed payload.
-        return call_gemini(payload)
+        return call_gemini_with_deadline(payload, deadline, 'generate_random_job')
     except Exception as e:
         # If the API call fails for any reason (e.g., network error, bad API key),
         # this block will execute, preventing the game from crashing.
@@ -70,7 +168,7 @@ def generate_random_job(country):
         return FALLBACK_JOB
 
 
-def generate_rent_options(country, income):
+def generate_rent_options(country, income, deadline=AI_DEADLINE_SECONDS):
     """Generates 5 realistic rental options based on country and income."""
     print("\nThinking of some places for you to live...")
     sentence_1 = f'A person in {country} with a monthly income of ${income} needs to find a place to live.'
@@ -94,7 +192,7 @@ def generate_rent_options(country, income):
                "generationConfig": {"responseMimeType": "application/json", "responseSchema": schema}}
     try:
         # Call the API and extract the 'rentals' list from the returned data.
-        data = call_gemini(payload)
+        data = call_gemini_with_deadline(payload, deadline, 'generate_rent_options')
         return data['rentals']
     except Exception as e:
         # If the API call fails, return the predefined list of fallback options.
@@ -102,7 +200,7 @@ def generate_rent_options(country, income):
         return FALLBACK_RENT_OPTIONS
 
 
-def generate_life_event(player_profile):
+def generate_life_event(player_profile, deadline=AI_DEADLINE_SECONDS):
     """Generates a random, contextual, and choiceless life event for the player."""
     print("Thinking of a random life event...")
     # Construct a prompt with very specific instructions for the AI to ensure
@@ -125,14 +223,14 @@ def generate_life_event(player_profile):
 
     try:
         # Call the API to get the event.
-        return call_gemini(payload)
+        return call_gemini_with_deadline(payload, deadline, 'generate_life_event')
     except Exception as e:
         # Return a safe, predefined event if the API call fails.
         print(f"AI life event failed ({e}), using fallback.")
         return FALLBACK_LIFE_EVENT
 
 
-def generate_monthly_choices(player_profile):
+def generate_monthly_choices(player_profile, deadline=AI_DEADLINE_SECONDS):
     """Generates a list of optional spending choices for the month."""
     print("Thinking of some monthly spending choices...")
     sentence_1 = f"Generate 10 realistic monthly spending choices for a {player_profile['career']} in {player_profile['country']}"
@@ -156,7 +254,7 @@ def generate_monthly_choices(player_profile):
 
     try:
         # Get the data from the API.
-        data = call_gemini(payload)
+        data = call_gemini_with_deadline(payload, deadline, 'generate_monthly_choices')
         # Loop through the choices and ensure the cost is a negative number, as it's an expense.
         # This prevents the AI from creating a choice that accidentally gives the player money.
         for choice in data['choices']:
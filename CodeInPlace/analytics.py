@@ -0,0 +1,148 @@
+# This file turns the month-by-month history of finished games into an end-of-year report.
+# Histories are laid out as columns (one row per game, one column per month),
+# so every statistic is computed for thousands of games at once with numpy instead of Python loops.
+
+import json
+import os
+import numpy as np
+from config import GAME_LENGTH_MONTHS, WIN_GOAL_MONTHS, SESSIONS_FILE
+
+# The fields monthly_cycle() records for each month.
+HISTORY_FIELDS = ['savings', 'income', 'rent', 'event', 'spending']
+
+
+def save_session(state, path=SESSIONS_FILE):
+    """Appends a finished game to the sessions file so it can be included in group reports."""
+    session = {
+        'name': state.name,
+        'country': state.country,
+        'job_title': state.job_title,
+        'monthly_income': state.monthly_income,
+        'rent_expense': state.rent_expense,
+        'history': state.history,
+    }
+    with open(path, 'a') as f:
+        f.write(json.dumps(session) + '\n')
+
+
+def load_sessions(path=SESSIONS_FILE):
+    """Reads every stored game from the sessions file. Returns an empty list if there is none yet."""
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def sessions_to_columns(sessions, months=GAME_LENGTH_MONTHS):
+    """
+    Turns a list of sessions into one 2D array per history field (games x months).
+    Months a game never reached (because it ended early) are filled with NaN.
+    """
+    columns = {key: np.full((len(sessions), months), np.nan) for key in HISTORY_FIELDS}
+    for row, session in enumerate(sessions):
+        for entry in session['history']:
+            col = entry['month'] - 1
+            for key in HISTORY_FIELDS:
+                columns[key][row, col] = entry.get(key, np.nan)
+    columns['monthly_income'] = np.array([s['monthly_income'] for s in sessions], dtype=float)
+    return columns
+
+
+def compute_metrics(columns):
+    """
+    Computes the savings statistics for every game in one pass.
+    Each value in the returned dictionary is an array with one entry per game.
+    """
+    savings = columns['savings']
+    played = ~np.isnan(savings)
+    months_played = played.sum(axis=1)
+    rows = np.arange(savings.shape[0])
+
+    # Final savings is the last month each game actually reached.
+    final = np.where(months_played > 0, savings[rows, np.maximum(months_played - 1, 0)], 0.0)
+
+    # Maximum drawdown: the biggest fall from the highest savings seen so far (starting from $0).
+    peak = np.fmax.accumulate(np.fmax(savings, 0.0), axis=1)
+    drawdown = np.where(played, peak - savings, 0.0)
+    max_drawdown = drawdown.max(axis=1, initial=0.0)
+
+    # Burn rate: average money going out each month (rent, spending and any costly life events).
+    # It is NaN for games whose history doesn't record these fields.
+    outflow = columns['rent'] - np.minimum(columns['event'], 0.0) - columns['spending']
+    outflow_sum = np.where(played, outflow, 0.0).sum(axis=1)
+    burn_rate = np.divide(outflow_sum, months_played, out=np.zeros_like(outflow_sum), where=months_played > 0)
+
+    # Month of peak debt: when savings were lowest, or 0 if the player was never in debt.
+    lowest = np.where(played, savings, np.inf)
+    deepest_month = lowest.argmin(axis=1) + 1
+    peak_debt = lowest.min(axis=1, initial=0.0)
+    month_of_peak_debt = np.where(peak_debt < 0, deepest_month, 0)
+
+    # Months to goal: the first month savings reached the win goal, or 0 if it never did.
+    goal = columns['monthly_income'] * WIN_GOAL_MONTHS
+    reached = np.where(played, savings, -np.inf) >= goal[:, None]
+    months_to_goal = np.where(reached.any(axis=1), reached.argmax(axis=1) + 1, 0)
+
+    return {
+        'months_played': months_played,
+        'final_savings': final,
+        'goal': goal,
+        'max_drawdown': max_drawdown,
+        'burn_rate': burn_rate,
+        'peak_debt': peak_debt,
+        'month_of_peak_debt': month_of_peak_debt,
+        'months_to_goal': months_to_goal,
+    }
+
+
+def session_report(state):
+    """Returns the statistics for a single game, as plain numbers, plus its savings trajectory."""
+    session = {'monthly_income': state.monthly_income, 'history': state.history}
+    columns = sessions_to_columns([session])
+    report = {key: value[0].item() for key, value in compute_metrics(columns).items()}
+    report['trajectory'] = [entry['savings'] for entry in state.history]
+    return report
+
+
+def group_report(sessions):
+    """Summarises many stored games at once: averages, medians and how many players hit the goal."""
+    if not sessions:
+        return {'players': 0}
+    metrics = compute_metrics(sessions_to_columns(sessions))
+    return {
+        'players': len(sessions),
+        'win_rate': float((metrics['months_to_goal'] > 0).mean()),
+        'debt_rate': float((metrics['month_of_peak_debt'] > 0).mean()),
+        'mean_final_savings': float(metrics['final_savings'].mean()),
+        'median_final_savings': float(np.median(metrics['final_savings'])),
+        'mean_max_drawdown': float(metrics['max_drawdown'].mean()),
+        'mean_burn_rate': _mean_ignoring_missing(metrics['burn_rate']),
+    }
+
+
+def _mean_ignoring_missing(values):
+    """Returns the mean of the values that aren't NaN, or NaN if every value is missing."""
+    present = values[~np.isnan(values)]
+    return float(present.mean()) if present.size else float('nan')
+
+
+def format_report(report, group=None):
+    """Turns a session report (and optionally a group report) into lines of text for the console."""
+    lines = [
+        f"Savings by month: {', '.join(f'${int(s):,}' for s in report['trajectory'])}",
+        f"Biggest drop in savings: ${int(report['max_drawdown']):,}",
+    ]
+    # Older histories only record savings, so there is no spending figure to show for them.
+    if not np.isnan(report['burn_rate']):
+        lines.append(f"Average spent per month: ${int(report['burn_rate']):,}")
+    if report['month_of_peak_debt']:
+        lines.append(f"Deepest debt: ${int(abs(report['peak_debt'])):,} in month {report['month_of_peak_debt']}")
+    else:
+        lines.append("You never went into debt!")
+    if report['months_to_goal']:
+        lines.append(f"You reached the savings goal in month {report['months_to_goal']}.")
+    if group and group['players'] > 1:
+        lines.append(
+            f"Across {group['players']} games: {group['win_rate']:.0%} reached the goal, "
+            f"average final savings ${int(group['mean_final_savings']):,}.")
+    return '\n'.join(lines)
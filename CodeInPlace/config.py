@@ -14,11 +14,58 @@ else:
 # Define the API URL for the Gemini model
 model = 'gemini-2.0-flash'
 API_URL = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={API_KEY}"
+# The same URL with a {model} placeholder, so the router can send each request to a different model
+API_URL_TEMPLATE = "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key=" + API_KEY
+
+# Models the router may choose from, with a rough quality score (higher is better)
+MODEL_QUALITY = {
+    'gemini-2.0-flash-lite': 1,
+    'gemini-2.0-flash': 2,
+    'gemini-2.5-flash': 3,
+}
+
+# What each generator needs: the lowest acceptable quality and how long (in seconds) it should take.
+# Routing is keyed by generator rather than by measuring payload size, because each generator always
+# sends a prompt and asks for a reply of roughly the same size (one event vs. a list of 10 choices).
+ROUTING_TARGETS = {
+    'generate_random_job': {'min_quality': 2, 'latency_target': 4.0},
+    'generate_rent_options': {'min_quality': 2, 'latency_target': 6.0},
+    'generate_life_event': {'min_quality': 1, 'latency_target': 2.0},
+    'generate_monthly_choices': {'min_quality': 2, 'latency_target': 8.0},
+}
+
+# A model that fails more often than this is avoided until nothing better is left
+MAX_ERROR_RATE = 0.2
+
+# Every this many calls, the router retries a model it hasn't used lately, so a model that was
+# slow or failing once gets a chance to show it has recovered
+ROUTER_EXPLORE_EVERY = 10
 
 # Game Constants
 
 GAME_LENGTH_MONTHS = 12
 
+# To win, the player must finish the year with this many months of income saved
+WIN_GOAL_MONTHS = 6
+
+# The game ends if savings drop below this at the end of a month
+DEBT_LIMIT = -2000
+
+# The chance of a random life event happening each month
+LIFE_EVENT_CHANCE = 0.5
+
+# Finished games are stored here (one JSON line per game) for the end-of-year report
+SESSIONS_FILE = 'sessions.jsonl'
+
+# Latency budget for every AI call (in seconds).
+# Once this passes, the game serves cached or fallback content instead of making the player wait.
+AI_DEADLINE_SECONDS = 8.0
+# The hard time limit for a single HTTP request. It is longer than the deadline so a late reply
+# can still fill the cache, but short enough that a hung request can't stop the game from exiting.
+AI_REQUEST_TIMEOUT_SECONDS = 2 * AI_DEADLINE_SECONDS
+# How many replies we need to see before trusting the observed p95 to decide when to hedge.
+HEDGE_MIN_SAMPLES = 5
+
 # Incase the AI fails
 FALLBACK_JOB= {'name': 'Teacher', 'income': 4000}
 
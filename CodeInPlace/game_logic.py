@@ -2,7 +2,7 @@
 import random, time
 from typing import List, Dict, Any
 from state import GameState
-from config import GAME_LENGTH_MONTHS
+from config import GAME_LENGTH_MONTHS, DEBT_LIMIT, LIFE_EVENT_CHANCE
 from utils import clear_screen, print_separator, typewriter_effect
 from ai_services import (
     generate_random_job,
@@ -100,7 +100,8 @@ def monthly_cycle(state: GameState) -> GameState:
     time.sleep(2)
 
     # --- Random Life Event (50%) ---
-    if random.random() < 0.5:
+    delta = 0
+    if random.random() < LIFE_EVENT_CHANCE:
         # Your AI expects a profile dict; pass what it needs
         event = generate_life_event({"career": state.job_title, "country": state.country})
         print_separator()
@@ -137,16 +138,20 @@ def monthly_cycle(state: GameState) -> GameState:
     state.savings += int(act['cost'])
     time.sleep(1)
 
-    # Record month-end snapshot
+    # Record month-end snapshot, including every money movement so analytics can replay the month
     state.history.append({
         'month': state.month,
         'savings': state.savings,
+        'income': int(state.monthly_income),
+        'rent': int(state.rent_expense),
+        'event': delta,
+        'spending': int(act['cost']),
     })
     return state
 
 def check_game_over(state: GameState) -> bool:
     """Checks for conditions that would end the game."""
-    if state.savings < -2000:
+    if state.savings < DEBT_LIMIT:
         print("\nYour debt has become unmanageable. Game over.")
         return True
     return False
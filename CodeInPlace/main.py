@@ -1,37 +1,50 @@
 # Import the necessary functions and constants from the other modules.
 # This keeps the main file clean and focused on the high-level game loop.
-from config import GAME_LENGTH_MONTHS
+import argparse
+import sys
+import game_logic
+from config import GAME_LENGTH_MONTHS, WIN_GOAL_MONTHS
 from utils import clear_screen, print_separator, typewriter_effect
 from game_logic import setup_game, monthly_cycle, check_game_over
+from profiler import Profiler
 
 # --- Main Application ---
 
-def main():
+def main(profile=False, profile_cpu=False, trace_file='profile_trace.folded', cpu_file='profile_cpu.prof'):
     """The main entry point for the AI Finance Quest game."""
+    # In '--profile' mode, every AI call, screen effect and prompt is timed and tagged by category.
+    # When profiling is off, the profiler does nothing and the game runs exactly as before.
+    profiler = Profiler(enabled=profile or profile_cpu, cpu=profile_cpu)
+    profiler.instrument(game_logic)
+    profiler.instrument(sys.modules[__name__])
+
     # Call setup_game() once at the beginning to initialize the player's profile.
     # The returned 'player' dictionary will hold all the game state.
-    player = setup_game()
+    with profiler.month('setup'):
+        player = setup_game()
 
     # This loop runs the game for the number of months defined in the config file.
     # The 'for...else' structure is used to handle the end-of-game summary cleanly.
     for month_num in range(1, GAME_LENGTH_MONTHS + 1):
-        # Set the current month in the player's profile.
-        player['month'] = month_num
+        # Everything in this block counts towards this month in the profile report.
+        with profiler.month(f'month {month_num}'):
+            # Set the current month in the player's profile.
+            player.month = month_num
 
-        # Call the main gameplay function for the current month.
-        # This returns the updated player profile.
-        player = monthly_cycle(player)
+            # Call the main gameplay function for the current month.
+            # This returns the updated player profile.
+            player = monthly_cycle(player)
 
-        # After each month, check if a game-over condition has been met.
-        if check_game_over(player):
-            # If the game is over, exit the loop immediately.
-            # This prevents the final summary from being displayed for a lost game.
-            break
+            # After each month, check if a game-over condition has been met.
+            if check_game_over(player):
+                # If the game is over, exit the loop immediately.
+                # This prevents the final summary from being displayed for a lost game.
+                break
 
-        # If it's not the last month, pause and wait for the user to proceed.
-        if player['month'] < GAME_LENGTH_MONTHS:
-            print_separator()
-            input("Press Enter to continue to the next month...")
+            # If it's not the last month, pause and wait for the user to proceed.
+            if player.month < GAME_LENGTH_MONTHS:
+                print_separator()
+                input("Press Enter to continue to the next month...")
 
     # --- Game Summary ---
     # The 'else' block of a 'for' loop is a special feature in Python.
@@ -41,27 +54,62 @@ def main():
         clear_screen()
         print_separator()
         print("Year complete! Final Summary:")
-        print(f"Final Savings: ${player['savings']:,}")
+        print(f"Final Savings: ${player.savings:,}")
         print_separator()
 
         # Calculate the win condition based on the player's income.
-        win_condition = player['income'] * 6
+        win_condition = int(player.monthly_income) * WIN_GOAL_MONTHS
 
         # Check the final savings against the win condition and display the appropriate outcome.
-        if player['savings'] >= win_condition:
+        if player.savings >= win_condition:
             typewriter_effect(
-                f"WINNER! You saved ${player['savings']:,}, reaching the goal of ${win_condition:,} (6 months' pay).")
+                f"WINNER! You saved ${player.savings:,}, reaching the goal of ${win_condition:,} ({WIN_GOAL_MONTHS} months' pay).")
             typewriter_effect("You are a financial superstar!")
-        elif player['savings'] > 0:
-            typewriter_effect(f"Great effort! You ended the year with positive savings of ${player['savings']:,}.")
+        elif player.savings > 0:
+            typewriter_effect(f"Great effort! You ended the year with positive savings of ${player.savings:,}.")
             typewriter_effect("You've built a solid financial foundation.")
         else:
             typewriter_effect("It was a tough year. You ended the year in debt.")
             typewriter_effect("Use this as a learning experience and try again!")
 
+    # --- End-of-Year Report ---
+    # Store this game with the others, then show how the year went and how it compares.
+    # The report needs numpy, so it is imported here and simply skipped if numpy isn't installed.
+    try:
+        from analytics import save_session, load_sessions, session_report, group_report, format_report
+    except ImportError:
+        print("\n(Install numpy to see your end-of-year report.)")
+    else:
+        save_session(player)
+        print_separator()
+        print("Your year in numbers:\n")
+        print(format_report(session_report(player), group_report(load_sessions())))
+
+    # --- Profile Report ---
+    # Shown whether the year was completed or not, so slow games that ended early can be checked too.
+    if profiler.enabled:
+        print_separator()
+        print("Profile: where the time went (seconds per month)\n")
+        print(profiler.report())
+        profiler.write_trace(trace_file)
+        print(f"\nFlame graph trace written to {trace_file}")
+        if profile_cpu:
+            profiler.write_cpu_stats(cpu_file)
+            print(f"CPU profile written to {cpu_file}")
+
 
 # This is a standard Python construct.
 # It ensures that the main() function is called only when this script is run directly,
 # not when it's imported as a module into another file.
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Play Budget Craft.")
+    parser.add_argument('--profile', action='store_true',
+                        help="time AI waits, screen effects and player input for every month")
+    parser.add_argument('--profile-cpu', action='store_true',
+                        help="also capture a cProfile of the CPU-bound parts (implies --profile)")
+    parser.add_argument('--trace-file', default='profile_trace.folded',
+                        help="where to write the flame graph trace")
+    parser.add_argument('--cpu-file', default='profile_cpu.prof',
+                        help="where to write the cProfile stats")
+    args = parser.parse_args()
+    main(args.profile, args.profile_cpu, args.trace_file, args.cpu_file)
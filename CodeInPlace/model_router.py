@@ -0,0 +1,151 @@
+# This file picks which Gemini model should answer each request.
+# It keeps a latency and error profile for every model and generator pair,
+# and sends each request to the fastest model that is good enough for the job.
+
+import random
+import threading
+import time
+from collections import defaultdict
+
+
+class ModelProfile:
+    """Tracks how fast and how reliable one model has been for one generator."""
+
+    # How much weight the newest sample gets in the moving averages.
+    SMOOTHING = 0.3
+
+    def __init__(self):
+        self.samples = 0
+        self.latency = 0.0
+        self.error_rate = 0.0
+        # The generator's call number when this model was last chosen and last recorded.
+        self.last_chosen = 0
+        self.last_recorded = 0
+
+    def record(self, seconds, ok, fresh=False):
+        """
+        Folds one finished call into the moving averages.
+        If 'fresh' is True the old numbers are out of date, so the new sample replaces them.
+        """
+        error = 0.0 if ok else 1.0
+        if self.samples == 0 or fresh:
+            self.latency = seconds
+            self.error_rate = error
+        else:
+            self.latency += self.SMOOTHING * (seconds - self.latency)
+            self.error_rate += self.SMOOTHING * (error - self.error_rate)
+        self.samples += 1
+
+
+class ModelRouter:
+    """Chooses a model for each generator based on quality, observed latency and errors."""
+
+    def __init__(self, models=None, targets=None, default_model=None, max_error_rate=None, explore_every=None):
+        # The settings are only read from config when they aren't passed in,
+        # so the router can be tried offline (for example with LocalStandIn) without an API key.
+        if None in (models, targets, default_model, max_error_rate, explore_every):
+            import config
+            models = models if models is not None else config.MODEL_QUALITY
+            targets = targets if targets is not None else config.ROUTING_TARGETS
+            default_model = default_model if default_model is not None else config.model
+            max_error_rate = max_error_rate if max_error_rate is not None else config.MAX_ERROR_RATE
+            explore_every = explore_every if explore_every is not None else config.ROUTER_EXPLORE_EVERY
+        self.models = dict(models)
+        self.targets = dict(targets)
+        self.default_model = default_model
+        self.max_error_rate = max_error_rate
+        self.explore_every = explore_every
+        self.profiles = {}
+        self.calls = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def profile(self, model, generator):
+        """Returns the profile for a model and generator pair, creating it if needed."""
+        with self._lock:
+            return self.profiles.setdefault((model, generator), ModelProfile())
+
+    def choose(self, generator):
+        """Returns the name of the model that should handle the next request for 'generator'."""
+        target = self.targets.get(generator)
+        if target is None:
+            return self.default_model
+
+        # Only consider models that are good enough for this generator.
+        candidates = [name for name, quality in self.models.items() if quality >= target['min_quality']]
+        if not candidates:
+            return self.default_model
+
+        # Try every candidate once before trusting the numbers, starting with the default model.
+        candidates.sort(key=lambda name: name != self.default_model)
+        profiles = {name: self.profile(name, generator) for name in candidates}
+        with self._lock:
+            self.calls[generator] += 1
+            call_number = self.calls[generator]
+
+        chosen = next((name for name in candidates if profiles[name].samples == 0), None)
+        if chosen is None:
+            chosen = self._best(candidates, profiles, target)
+            # Now and then, retry whichever other model has gone unused the longest.
+            # Without this, a model that was slow or failing once would never be picked again.
+            others = [name for name in candidates if name != chosen]
+            if others and call_number % self.explore_every == 0:
+                chosen = min(others, key=lambda name: profiles[name].last_chosen)
+        profiles[chosen].last_chosen = call_number
+        return chosen
+
+    def _best(self, candidates, profiles, target):
+        """Returns the fastest healthy candidate that meets the latency target, based on its profile."""
+        healthy = [name for name in candidates if profiles[name].error_rate <= self.max_error_rate]
+        on_time = [name for name in healthy if profiles[name].latency <= target['latency_target']]
+        if on_time:
+            return min(on_time, key=lambda name: profiles[name].latency)
+        if healthy:
+            return min(healthy, key=lambda name: profiles[name].latency)
+        # Everything is failing, so go with whichever model fails least.
+        return min(candidates, key=lambda name: profiles[name].error_rate)
+
+    def record(self, model, generator, seconds, ok):
+        """Records how a call went so future choices can use it."""
+        profile = self.profile(model, generator)
+        with self._lock:
+            # A profile that hasn't been updated for a while is stale, so the new sample replaces it.
+            call_number = self.calls[generator]
+            fresh = call_number - profile.last_recorded >= self.explore_every
+            profile.record(seconds, ok, fresh)
+            profile.last_recorded = call_number
+
+    def call(self, generator, payload, send):
+        """
+        Sends 'payload' to the chosen model using send(payload, model) and records the outcome.
+        Any exception from 'send' is recorded as an error and then raised again.
+        """
+        chosen = self.choose(generator)
+        start = time.monotonic()
+        try:
+            result = send(payload, chosen)
+        except Exception:
+            self.record(chosen, generator, time.monotonic() - start, ok=False)
+            raise
+        self.record(chosen, generator, time.monotonic() - start, ok=True)
+        return result
+
+
+class LocalStandIn:
+    """
+    A fake Gemini service for trying the router without the internet.
+    Each model sleeps for its configured latency and fails at its configured error rate.
+    """
+
+    def __init__(self, latencies, error_rates=None, reply=None, seed=None):
+        self.latencies = latencies
+        self.error_rates = error_rates or {}
+        self.reply = reply if reply is not None else {}
+        self.calls = []
+        self._random = random.Random(seed)
+
+    def __call__(self, payload, model):
+        self.calls.append(model)
+        time.sleep(self.latencies[model])
+        if self._random.random() < self.error_rates.get(model, 0.0):
+            raise RuntimeError(f"{model} is unavailable")
+        return self.reply
@@ -0,0 +1,165 @@
+# This file powers the '--profile' mode of the game.
+# It times every step of setup_game() and monthly_cycle() and sorts the time into categories,
+# so we can tell whether a slow game was waiting on the AI, on screen effects, or on the player.
+
+import builtins
+import cProfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+# The categories every span is tagged with.
+# 'logic' is whatever is left over: the game's own (CPU-bound) work.
+CATEGORIES = ['ai', 'render', 'input', 'logic']
+
+# Time spent in these categories is waiting, not computing, so cProfile is paused during them.
+WAITING_CATEGORIES = {'ai', 'render', 'input'}
+
+# The functions instrument() wraps, and the category each one belongs to.
+INSTRUMENTED = {
+    'generate_random_job': 'ai',
+    'generate_rent_options': 'ai',
+    'generate_life_event': 'ai',
+    'generate_monthly_choices': 'ai',
+    'typewriter_effect': 'render',
+    'clear_screen': 'render',
+    'print_separator': 'render',
+    'input': 'input',
+}
+
+
+class _TimedSleep:
+    """Stands in for the 'time' module inside a game module so time.sleep() is recorded as render delay."""
+
+    def __init__(self, profiler, module):
+        self._profiler = profiler
+        self._module = module
+
+    def __getattr__(self, name):
+        return getattr(self._module, name)
+
+    def sleep(self, seconds):
+        with self._profiler.span('time.sleep', 'render'):
+            self._module.sleep(seconds)
+
+
+class Profiler:
+    """Collects tagged timing spans, grouped by month, plus an optional cProfile capture."""
+
+    def __init__(self, enabled=True, cpu=False):
+        self.enabled = enabled
+        # Per-month totals for each category, plus the month's wall time.
+        self.months = defaultdict(lambda: defaultdict(float))
+        self.month_order = []
+        # Self time for every unique stack of span names, for the flame graph.
+        self.stacks = defaultdict(float)
+        self._frames = []
+        self._month = None
+        self._cpu = cProfile.Profile() if enabled and cpu else None
+        self._waiting = 0
+
+    @contextmanager
+    def span(self, name, category):
+        """Times the code inside the 'with' block and tags it with a category."""
+        if not self.enabled:
+            yield
+            return
+
+        # Pause cProfile while we are only waiting, so it covers the CPU-bound parts.
+        waiting = category in WAITING_CATEGORIES
+        if waiting:
+            if self._waiting == 0 and self._cpu is not None:
+                self._cpu.disable()
+            self._waiting += 1
+
+        # Each frame is [name, category, time spent in child spans].
+        frame = [name, category, 0.0]
+        self._frames.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._frames.pop()
+            # Only count time not already counted by a child span, so nothing is counted twice.
+            self_time = elapsed - frame[2]
+            if self._frames:
+                self._frames[-1][2] += elapsed
+            stack = ';'.join(f[0] for f in self._frames + [frame])
+            self.stacks[stack] += self_time
+            if self._month is not None:
+                self.months[self._month][category] += self_time
+
+            if waiting:
+                self._waiting -= 1
+                if self._waiting == 0 and self._cpu is not None:
+                    self._cpu.enable()
+
+    @contextmanager
+    def month(self, label):
+        """Groups every span inside the 'with' block under one month of the report."""
+        if not self.enabled:
+            yield
+            return
+        self._month = label
+        self.month_order.append(label)
+        if self._cpu is not None:
+            self._cpu.enable()
+        start = time.perf_counter()
+        try:
+            with self.span(label, 'logic'):
+                yield
+        finally:
+            self.months[label]['wall'] += time.perf_counter() - start
+            if self._cpu is not None:
+                self._cpu.disable()
+            self._month = None
+
+    def wrap(self, func, name, category):
+        """Returns a version of 'func' that records every call as a span."""
+        def timed(*args, **kwargs):
+            with self.span(name, category):
+                return func(*args, **kwargs)
+        timed.__name__ = getattr(func, '__name__', name)
+        timed.__doc__ = func.__doc__
+        return timed
+
+    def instrument(self, module):
+        """Wraps the AI, render and input functions a game module uses so they are timed."""
+        if not self.enabled:
+            return
+        for name, category in INSTRUMENTED.items():
+            # 'input' usually comes from builtins, so look there if the module has no copy of its own.
+            func = getattr(module, name, None)
+            if func is None and name == 'input':
+                func = builtins.input
+            if func is not None:
+                setattr(module, name, self.wrap(func, name, category))
+        if getattr(module, 'time', None) is time:
+            module.time = _TimedSleep(self, time)
+
+    def report(self):
+        """Returns a table of how each month's wall time was split between the categories."""
+        lines = [f"{'Month':<12}{'Wall':>10}" + ''.join(f"{c.title():>10}" for c in CATEGORIES)]
+        totals = defaultdict(float)
+        for label in self.month_order:
+            row = self.months[label]
+            lines.append(f"{label:<12}{row['wall']:>9.2f}s" + ''.join(f"{row[c]:>9.2f}s" for c in CATEGORIES))
+            for key in ['wall'] + CATEGORIES:
+                totals[key] += row[key]
+        lines.append(f"{'Total':<12}{totals['wall']:>9.2f}s" + ''.join(f"{totals[c]:>9.2f}s" for c in CATEGORIES))
+        return '\n'.join(lines)
+
+    def write_trace(self, path):
+        """
+        Writes the spans in the 'folded stacks' format used by flamegraph.pl and speedscope.
+        Each line is a ';'-separated stack of span names followed by its self time in microseconds.
+        """
+        with open(path, 'w') as f:
+            for stack, seconds in self.stacks.items():
+                f.write(f"{stack} {int(seconds * 1_000_000)}\n")
+
+    def write_cpu_stats(self, path):
+        """Saves the cProfile capture (if any) so it can be opened with pstats or snakeviz."""
+        if self._cpu is not None:
+            self._cpu.dump_stats(path)
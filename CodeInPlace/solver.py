@@ -0,0 +1,109 @@
+# This file finds the best possible way to play a season, for tuning the game's difficulty.
+# Trying every path is impossible (10 choices a month for 12 months is 10^12 paths),
+# so it uses dynamic programming over (month, savings) states instead.
+# Savings are tracked in whole-dollar buckets, just like monthly_cycle() rounds every cost,
+# and each month's table of reachable states is stored as the bits of one Python integer,
+# so a whole month is solved with a handful of shifts instead of one step per path.
+
+import math
+from dataclasses import dataclass, field
+from typing import List, Dict, Any
+from config import WIN_GOAL_MONTHS, DEBT_LIMIT, LIFE_EVENT_CHANCE
+
+# What the solver should aim for.
+# 'savings' finds the path with the highest final savings.
+# 'goal' finds the path that reaches the win goal while spending the most on monthly choices,
+# which shows how much freedom a player has and still wins.
+OBJECTIVES = ('savings', 'goal')
+
+
+@dataclass
+class Season:
+    monthly_income: float
+    rent_expense: float
+    # One list of choices per month, in the same format generate_monthly_choices() returns.
+    monthly_choices: List[List[Dict[str, Any]]]
+    # The typical cost of a life event (negative for a loss), weighted by how often events happen.
+    # The default of 0 assumes events even out; pass a negative cost to test against costly events.
+    event_cost: float = 0.0
+    starting_savings: float = 0
+
+
+@dataclass
+class SeasonSolution:
+    picks: List[int] = field(default_factory=list)
+    final_savings: float = 0
+    total_spent: float = 0
+    reaches_goal: bool = False
+    feasible: bool = False
+
+
+def _reachable_spending(season, fixed, spend):
+    """
+    Builds the DP table: for each month, an integer whose bit 's' is set if exactly $s can have
+    been spent on choices by the end of that month without any month ending below the DEBT_LIMIT.
+    Entry 0 is the start of the season, when nothing has been spent yet.
+    """
+    table = [1]
+    for month, month_spend in enumerate(spend, start=1):
+        reachable = 0
+        for amount in set(month_spend):
+            reachable |= table[-1] << amount
+        # Savings at the end of this month are starting_savings + month * fixed - spent,
+        # so staying at or above the DEBT_LIMIT caps how much can have been spent.
+        limit = math.floor(season.starting_savings + month * fixed - DEBT_LIMIT)
+        reachable = reachable & ((1 << (limit + 1)) - 1) if limit >= 0 else 0
+        table.append(reachable)
+    return table
+
+
+def solve_season(season: Season, objective: str = 'savings') -> SeasonSolution:
+    """
+    Finds the choice for each month that gives the best outcome for the season.
+    Every month is played with the expected life-event cost, and no path may end a month
+    below the DEBT_LIMIT used by check_game_over().
+    'picks' holds the index of the chosen option for each month.
+    For 'goal', if the goal can't be reached the best-savings path is returned with reaches_goal=False.
+    Choice costs are rounded to whole dollars like in monthly_cycle(), so the answer is exact.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"objective must be one of {OBJECTIVES}, not {objective!r}")
+
+    months = len(season.monthly_choices)
+    goal = season.monthly_income * WIN_GOAL_MONTHS
+    # The money that comes and goes every month no matter what the player picks.
+    fixed = season.monthly_income - season.rent_expense + LIFE_EVENT_CHANCE * season.event_cost
+    # How much each choice spends, as a whole number of dollars.
+    spend = [[abs(int(choice['cost'])) for choice in choices] for choices in season.monthly_choices]
+
+    table = _reachable_spending(season, fixed, spend)
+    final = table[-1]
+    if not final:
+        return SeasonSolution()
+
+    # The least that can be spent gives the highest savings.
+    spent = (final & -final).bit_length() - 1
+    if objective == 'goal':
+        # Reaching the goal caps total spending, so take the most that fits under the cap.
+        budget = math.floor(season.starting_savings + months * fixed - goal)
+        if budget >= spent:
+            spent = (final & ((1 << (budget + 1)) - 1)).bit_length() - 1
+
+    # Walk back through the table to find a choice for each month that leads to this total.
+    picks, remaining = [], spent
+    for month in range(months, 0, -1):
+        for pick, amount in enumerate(spend[month - 1]):
+            if amount <= remaining and table[month - 1] >> (remaining - amount) & 1:
+                picks.append(pick)
+                remaining -= amount
+                break
+    picks.reverse()
+
+    final_savings = season.starting_savings + months * fixed - spent
+    return SeasonSolution(picks=picks, final_savings=final_savings, total_spent=spent,
+                          reaches_goal=final_savings >= goal, feasible=True)
+
+
+def score_seasons(seasons: List[Season], objective: str = 'savings') -> List[SeasonSolution]:
+    """Solves many generated seasons, for example to compare how hard different jobs and rents are."""
+    return [solve_season(season, objective) for season in seasons]
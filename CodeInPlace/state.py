@@ -5,9 +5,9 @@ from typing import List, Dict, Any
 class GameState:
     name: str
     country: str
-    career: str
-    income: float
+    job_title: str
+    monthly_income: float
     rent_expense: float
     savings: float
-    month = int = 1
+    month: int = 1
     history: List[Dict[str,Any]] = field(default_factory=list)
\ No newline at end of file
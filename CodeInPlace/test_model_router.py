@@ -0,0 +1,57 @@
+import unittest
+from model_router import ModelRouter, LocalStandIn
+
+MODELS = {'lite': 1, 'flash': 2, 'pro': 3}
+TARGETS = {
+    'generate_life_event': {'min_quality': 1, 'latency_target': 0.02},
+    'generate_monthly_choices': {'min_quality': 2, 'latency_target': 0.05},
+}
+
+
+def make_router():
+    return ModelRouter(models=MODELS, targets=TARGETS, default_model='flash', max_error_rate=0.2, explore_every=5)
+
+
+def run(router, generator, stand_in, times):
+    """Sends 'times' requests through the router, ignoring failures, and returns the models used."""
+    start = len(stand_in.calls)
+    for _ in range(times):
+        try:
+            router.call(generator, {}, stand_in)
+        except RuntimeError:
+            pass
+    return stand_in.calls[start:]
+
+
+class ModelRouterTest(unittest.TestCase):
+
+    def test_picks_fastest_model_that_meets_the_target(self):
+        stand_in = LocalStandIn({'lite': 0.001, 'flash': 0.01, 'pro': 0.03})
+        used = run(make_router(), 'generate_life_event', stand_in, 20)
+        self.assertEqual(used[:3], ['flash', 'lite', 'pro'])
+        self.assertGreaterEqual(used[3:].count('lite'), 13)
+
+    def test_respects_minimum_quality(self):
+        stand_in = LocalStandIn({'lite': 0.001, 'flash': 0.01, 'pro': 0.02})
+        used = run(make_router(), 'generate_monthly_choices', stand_in, 12)
+        self.assertNotIn('lite', used)
+        self.assertGreaterEqual(used.count('flash'), 9)
+
+    def test_failed_model_is_retried_after_it_recovers(self):
+        stand_in = LocalStandIn({'lite': 0.001, 'flash': 0.01, 'pro': 0.02}, error_rates={'lite': 1.0})
+        router = make_router()
+        # While failing, 'lite' only gets the occasional retry.
+        self.assertLessEqual(run(router, 'generate_life_event', stand_in, 10)[3:].count('lite'), 2)
+        stand_in.error_rates['lite'] = 0.0
+        self.assertGreaterEqual(run(router, 'generate_life_event', stand_in, 20)[-10:].count('lite'), 8)
+
+    def test_slow_model_is_retried_after_it_speeds_up(self):
+        stand_in = LocalStandIn({'lite': 0.05, 'flash': 0.01, 'pro': 0.02})
+        router = make_router()
+        run(router, 'generate_life_event', stand_in, 10)
+        stand_in.latencies['lite'] = 0.001
+        self.assertGreaterEqual(run(router, 'generate_life_event', stand_in, 20)[-10:].count('lite'), 8)
+
+
+if __name__ == '__main__':
+    unittest.main()